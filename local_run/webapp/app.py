@@ -4,17 +4,36 @@ Trivy DB Control Center
 A Flask-based web interface for monitoring and controlling the Trivy DB build process
 """
 
+import fcntl
+import hashlib
 import os
-import json
+import select
 import subprocess
 import threading
+import time
 from datetime import datetime
+from email.utils import formatdate
 from pathlib import Path
-from flask import Flask, render_template, jsonify, send_file, request
-from collections import deque
+from flask import Flask, render_template, request, Response
+from werkzeug.wsgi import wrap_file
+
+import orjson
+
+from log_ring import LogRing
 
 app = Flask(__name__)
 
+# Opt-in kernel-side downloads behind a fronting server:
+#   X_SENDFILE=1            - Apache mod_xsendfile / lighttpd: responses
+#                             carry an X-Sendfile header with the
+#                             filesystem path
+#   X_ACCEL_REDIRECT_PREFIX - nginx: URI prefix of an `internal` location
+#                             mapped to OUTPUT_DIR (nginx ignores
+#                             X-Sendfile and needs X-Accel-Redirect with
+#                             a URI, not a path)
+app.use_x_sendfile = os.environ.get("X_SENDFILE", "0") == "1"
+X_ACCEL_REDIRECT_PREFIX = os.environ.get("X_ACCEL_REDIRECT_PREFIX", "").rstrip("/")
+
 # Configuration
 SCRIPT_DIR = Path(__file__).parent.parent.resolve()
 BUILD_SCRIPT = SCRIPT_DIR / "build-db-vm.sh"
@@ -25,8 +44,59 @@ OUTPUT_DIR = Path(os.environ.get("OUTPUT_DIR", str(SCRIPT_DIR / "output")))
 
 LOCK_FILE = Path("/tmp/build-db-vm.lock")
 LOG_FILE = Path("/tmp/trivy-db-build.log")
+
+# Plain-string forms for the hot paths, computed once at import.
+# os.path.exists/os.stat on a str skip the per-call Path object that
+# `Path(OUTPUT_DIR) / "trivy.db"` would allocate on every request.
+_SCRIPT_DIR = str(SCRIPT_DIR)
+_BUILD_SCRIPT = str(BUILD_SCRIPT)
+_OUTPUT_DIR = str(OUTPUT_DIR)
+_DB_FILE = os.path.join(_OUTPUT_DIR, "trivy.db")
+_DB_TAR = os.path.join(_OUTPUT_DIR, "trivy.db.tar.gz")
+_METADATA_FILE = os.path.join(_OUTPUT_DIR, "metadata.json")
+_LOCK_FILE = str(LOCK_FILE)
+_LOG_FILE = str(LOG_FILE)
 MAX_LOG_LINES = int(os.environ.get("LOG_BUFFER_SIZE", "5000"))
 
+# Log write batching: flush to disk every N lines or T seconds, whichever
+# comes first. Durable writes (O_DSYNC) are off by default - the build
+# log doesn't need power-loss durability.
+LOG_BATCH_LINES = int(os.environ.get("LOG_BATCH_LINES", "64"))
+LOG_BATCH_SECONDS = float(os.environ.get("LOG_BATCH_MS", "100")) / 1000.0
+LOG_USE_FSYNC = os.environ.get("LOG_USE_FSYNC", "false").lower() == "true"
+
+# Raw append-only fd for log persistence, opened lazily and kept across
+# builds. os.write of a joined batch skips Python's buffered-IO machinery
+# entirely, and O_APPEND keeps concurrent tail reads in /api/logs
+# consistent without any lseek coordination.
+_log_fd = None
+_log_fd_lock = threading.Lock()
+
+
+def _log_file_fd():
+    global _log_fd
+    with _log_fd_lock:
+        if _log_fd is None:
+            flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+            if LOG_USE_FSYNC:
+                flags |= os.O_DSYNC
+            _log_fd = os.open(_LOG_FILE, flags, 0o644)
+        return _log_fd
+
+
+def _log_file_reset():
+    """Close and remove the log file so the next write starts fresh"""
+    global _log_fd
+    with _log_fd_lock:
+        if _log_fd is not None:
+            os.close(_log_fd)
+            _log_fd = None
+        try:
+            os.unlink(_LOG_FILE)
+        except FileNotFoundError:
+            pass
+
+
 # Print configuration for debugging
 print(f"Configuration:")
 print(f"  SCRIPT_DIR: {SCRIPT_DIR}")
@@ -35,78 +105,302 @@ print(f"  CACHE_DIR: {CACHE_DIR}")
 print(f"  OUTPUT_DIR: {OUTPUT_DIR}")
 print(f"  LOG_BUFFER_SIZE: {MAX_LOG_LINES} lines")
 
-# In-memory log buffer
-log_buffer = deque(maxlen=MAX_LOG_LINES)
 
+# In-memory log buffer. The producer publishes lines in batches - one
+# extend plus a sequence bump - so readers can snapshot the ring only when
+# the sequence number actually changed (flat combining: one party does the
+# batched work, everyone else reuses it). _log_lock guards the sequence
+# counter and the /api/logs snapshot: += on a global is a load/add/store,
+# so concurrent bumps from the build thread and request threads could
+# otherwise lose an increment and leave readers on a stale snapshot.
+log_buffer = LogRing(MAX_LOG_LINES)
+_log_lock = threading.Lock()
+_log_seq = 0
 
-def get_build_status():
-    """Check if a build is currently running"""
-    if LOCK_FILE.exists():
-        try:
-            with open(LOCK_FILE, 'r') as f:
-                pid = int(f.read().strip())
-            # Check if process is actually running
-            try:
-                os.kill(pid, 0)
-                return {"status": "running", "pid": pid}
-            except OSError:
-                # Process not running but lock file exists (stale lock)
-                return {"status": "stale_lock", "pid": pid}
-        except Exception as e:
-            return {"status": "error", "message": str(e)}
-    return {"status": "idle"}
 
+def _log_publish(lines_batch):
+    """Push a batch of lines into the buffer as one operation"""
+    global _log_seq
+    log_buffer.extend(lines_batch)
+    with _log_lock:
+        _log_seq += 1
 
-def get_db_info():
-    """Get information about the latest database build"""
-    db_file = Path(OUTPUT_DIR) / "trivy.db"
-    db_tar = Path(OUTPUT_DIR) / "trivy.db.tar.gz"
-    metadata_file = Path(OUTPUT_DIR) / "metadata.json"
-    
+
+def _log_append(line):
+    """Publish a single out-of-band line (start/stop/error messages)"""
+    _log_publish((line,))
+
+
+def _log_clear():
+    global _log_seq
+    log_buffer.clear()
+    with _log_lock:
+        _log_seq += 1
+
+
+# Last snapshot handed to /api/logs, keyed on the sequence number at the
+# time it was taken; read and written under _log_lock
+_LOG_SNAPSHOT = {"seq": -1, "lines": 0, "val": []}
+
+
+def _read_build_status():
+    """Derive the build state from the lock file.
+
+    Reads the lock file in one shot and handles each failure mode with a
+    narrow except - the common idle path is a single FileNotFoundError
+    rather than an exists() syscall followed by a broad Exception handler.
+    """
+    try:
+        with open(_LOCK_FILE, 'rb') as f:
+            data = f.read(32)
+    except FileNotFoundError:
+        return {"status": "idle"}
+    except OSError as e:
+        return {"status": "error", "message": str(e)}
+
+    try:
+        pid = int(data)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+
+    # Check if the process is actually running
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        # Process not running but lock file exists (stale lock)
+        return {"status": "stale_lock", "pid": pid}
+    except PermissionError:
+        # Process exists but belongs to another user - still running
+        pass
+    return {"status": "running", "pid": pid}
+
+
+_METADATA_CACHE = {"mtime": None, "parsed": None}
+
+
+def _read_db_info():
+    """Derive database info from one scandir pass over OUTPUT_DIR"""
     info = {
-        "db_exists": db_file.exists(),
+        "db_exists": False,
         "db_size": None,
         "db_mtime": None,
-        "tar_exists": db_tar.exists(),
+        "tar_exists": False,
         "tar_size": None,
         "metadata": None
     }
-    
-    if db_file.exists():
-        stat = db_file.stat()
-        info["db_size"] = stat.st_size
-        info["db_mtime"] = datetime.fromtimestamp(stat.st_mtime).isoformat()
-    
-    if db_tar.exists():
-        stat = db_tar.stat()
-        info["tar_size"] = stat.st_size
-    
-    if metadata_file.exists():
-        try:
-            with open(metadata_file, 'r') as f:
-                info["metadata"] = json.load(f)
-        except Exception:
-            pass
-    
+
+    meta_stat = None
+    try:
+        # A single directory scan covers all three files; entry.stat() is
+        # served from the scandir results rather than issuing fresh syscalls.
+        with os.scandir(_OUTPUT_DIR) as entries:
+            for entry in entries:
+                if entry.name == "trivy.db":
+                    stat = entry.stat()
+                    info["db_exists"] = True
+                    info["db_size"] = stat.st_size
+                    info["db_mtime"] = datetime.fromtimestamp(stat.st_mtime).isoformat()
+                elif entry.name == "trivy.db.tar.gz":
+                    info["tar_exists"] = True
+                    info["tar_size"] = entry.stat().st_size
+                elif entry.name == "metadata.json":
+                    meta_stat = entry.stat()
+    except FileNotFoundError:
+        pass
+
+    if meta_stat is not None:
+        # Re-parse metadata only when its mtime changed since the last read
+        if meta_stat.st_mtime != _METADATA_CACHE["mtime"]:
+            try:
+                with open(_METADATA_FILE, 'rb') as f:
+                    _METADATA_CACHE["parsed"] = orjson.loads(f.read())
+                _METADATA_CACHE["mtime"] = meta_stat.st_mtime
+            except (OSError, ValueError):
+                # Mid-build: file may be gone or half-written
+                pass
+        info["metadata"] = _METADATA_CACHE["parsed"]
+
     return info
 
 
+# Cached single-pass snapshot of build state plus database info: one open
+# of the lock file and one scandir of OUTPUT_DIR cover both, instead of
+# each helper touching the filesystem independently per request. The TTL
+# amortizes dashboard polling to ~zero syscalls; admin actions invalidate
+# explicitly so they observe fresh state immediately.
+_SNAPSHOT_TTL = 1.0
+_SNAPSHOT = {"ts": 0.0, "build": None, "db": None}
+
+
+def _snapshot():
+    now = time.monotonic()
+    if _SNAPSHOT["build"] is not None and now - _SNAPSHOT["ts"] < _SNAPSHOT_TTL:
+        return _SNAPSHOT
+    _SNAPSHOT["build"] = _read_build_status()
+    _SNAPSHOT["db"] = _read_db_info()
+    _SNAPSHOT["ts"] = now
+    return _SNAPSHOT
+
+
+def _invalidate_snapshot():
+    # Only the timestamp is reset; "build"/"db" stay populated so a reader
+    # that already passed the freshness check never sees a half-cleared
+    # snapshot. The zero ts forces the next _snapshot() call to recompute.
+    global _status_payload
+    _SNAPSHOT["ts"] = 0.0
+    # Also drop the refresher's published bytes - otherwise a /api/status
+    # poll right after an admin action serves the pre-action payload for
+    # up to a refresh interval instead of recomputing inline.
+    _status_payload = None
+
+
+def get_build_status():
+    """Check if a build is currently running"""
+    return _snapshot()["build"]
+
+
+def get_db_info():
+    """Get information about the latest database build"""
+    return _snapshot()["db"]
+
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+
 def format_size(size_bytes):
-    """Format bytes to human-readable size"""
+    """Format bytes to human-readable size.
+
+    Picks the unit straight from the bit length (each unit step is 10 bits)
+    instead of dividing in a loop - one divide, one index.
+    """
     if size_bytes is None:
         return "N/A"
-    
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.2f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.2f} TB"
+
+    i = min(max(0, (int(size_bytes).bit_length() - 1) // 10), len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (i * 10)):.2f} {_SIZE_UNITS[i]}"
+
+
+def _json_bytes(payload, status=200):
+    """Wrap pre-serialized JSON bytes in a Response, ETagging GETs.
+
+    Successful GET responses carry an ETag over the serialized payload so
+    idle dashboard polls come back as 304s without re-sending the body.
+    """
+    resp = Response(payload, status=status, mimetype='application/json')
+    if status == 200 and request.method in ('GET', 'HEAD'):
+        resp.set_etag(hashlib.blake2b(payload, digest_size=8).hexdigest())
+        return resp.make_conditional(request)
+    return resp
+
+
+def _json(obj, status=200):
+    """JSON response via orjson (C encoder, ~3-5x faster than stdlib json)"""
+    return _json_bytes(orjson.dumps(obj), status)
+
+
+# Tail-read cache: rapid dashboard polls hit the same (size, mtime, lines)
+# key and get the parsed tail back without touching the file again.
+_LOG_TAIL_TTL = 0.5
+_LOG_TAIL_CACHE = {"key": None, "ts": 0.0, "val": []}
+
+
+def _tail_log_file(lines):
+    """Read the last `lines` lines of LOG_FILE without loading the whole file.
+
+    Seeks to an estimated window before EOF and reads forward, doubling the
+    window (at most twice) if it caught fewer lines than asked for. Keeps
+    bytes read per poll at O(lines * avg_line_len) instead of O(filesize).
+    """
+    try:
+        st = os.stat(_LOG_FILE)
+    except FileNotFoundError:
+        return []
+
+    key = (st.st_size, st.st_mtime, lines)
+    now = time.monotonic()
+    if _LOG_TAIL_CACHE["key"] == key and now - _LOG_TAIL_CACHE["ts"] < _LOG_TAIL_TTL:
+        return _LOG_TAIL_CACHE["val"]
+
+    tail = []
+    try:
+        with open(_LOG_FILE, 'rb') as f:
+            fsize = os.fstat(f.fileno()).st_size
+            window = 64 * lines  # assume ~64 bytes per line to start
+            offset = 0
+            for _ in range(3):
+                offset = max(0, fsize - window)
+                f.seek(offset)
+                tail = f.read().decode('utf-8', 'replace').splitlines(keepends=True)
+                if offset == 0 or len(tail) > lines:
+                    break
+                window *= 2
+            if offset > 0:
+                # A mid-file read almost certainly starts inside a line -
+                # drop the partial first element unconditionally; one
+                # fewer line beats a corrupted one
+                tail = tail[1:]
+            tail = tail[-lines:]
+    except OSError:
+        return []
+
+    _LOG_TAIL_CACHE["key"] = key
+    _LOG_TAIL_CACHE["ts"] = now
+    _LOG_TAIL_CACHE["val"] = tail
+    return tail
+
+
+def _file_response(path, download_name, mimetype):
+    """Serve a file without copying its bytes through Python.
+
+    Routes the body through the WSGI server's `wsgi.file_wrapper`, which
+    gunicorn/uWSGI implement with sendfile(2) - the kernel moves the bytes
+    straight from the page cache to the socket. With X_SENDFILE (Apache
+    mod_xsendfile/lighttpd) or X_ACCEL_REDIRECT_PREFIX (nginx) configured,
+    the response is empty and the fronting server streams the file.
+    """
+    st = os.stat(path)
+    etag = f"{st.st_size:x}-{st.st_mtime_ns:x}"
+    last_mod = formatdate(st.st_mtime, usegmt=True)
+
+    # Conditional GET: clients that already hold this exact file (by ETag
+    # or If-Modified-Since, which has one-second resolution) get a 304
+    # before a single byte is opened or sent.
+    if request.if_none_match.contains(etag) or (
+            request.if_modified_since is not None
+            and int(st.st_mtime) <= request.if_modified_since.timestamp()):
+        return Response(status=304, headers={
+            'ETag': f'"{etag}"',
+            'Last-Modified': last_mod,
+        })
+
+    headers = {
+        'Content-Length': str(st.st_size),
+        'Last-Modified': last_mod,
+        'ETag': f'"{etag}"',
+        'Content-Disposition': f'attachment; filename="{download_name}"',
+    }
+    if X_ACCEL_REDIRECT_PREFIX:
+        headers['X-Accel-Redirect'] = f"{X_ACCEL_REDIRECT_PREFIX}/{os.path.basename(path)}"
+        return Response(b'', mimetype=mimetype, headers=headers)
+
+    if app.use_x_sendfile:
+        headers['X-Sendfile'] = str(path)
+        return Response(b'', mimetype=mimetype, headers=headers)
+
+    # wrap_file uses the server's wsgi.file_wrapper (sendfile(2) under
+    # gunicorn/uWSGI) and falls back to werkzeug's chunked FileWrapper on
+    # servers without one, like the dev server - a bare unbuffered FileIO
+    # body there would iterate via readline, one read(2) per byte.
+    fh = open(path, 'rb', buffering=0)
+    body = wrap_file(request.environ, fh, 65536)
+    return Response(body, mimetype=mimetype, headers=headers,
+                    direct_passthrough=True)
 
 
 def run_build_async(target='nvd', custom_sigs=False):
     """Run the build script asynchronously and capture output"""
-    log_buffer.clear()
-    log_buffer.append(f"[{datetime.now().isoformat()}] Starting build process (target: {target}, custom signatures: {custom_sigs})...\n")
+    _log_clear()
+    _log_append(f"[{datetime.now().isoformat()}] Starting build process (target: {target}, custom signatures: {custom_sigs})...\n")
     
     try:
         # Set environment variables
@@ -114,33 +408,71 @@ def run_build_async(target='nvd', custom_sigs=False):
         env['VULN_LIST_UPDATE_TARGET'] = target
         env['CUSTOM_SIGNATURES_ENABLED'] = 'true' if custom_sigs else 'false'
         
-        # Run the build script in its own process group
+        # Run the build script in its own process group. Binary, unbuffered
+        # stdout: lines are assembled here from large raw reads instead of
+        # one Python readline call (and one decode) per line.
         process = subprocess.Popen(
-            [str(BUILD_SCRIPT)],
+            [_BUILD_SCRIPT],
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            universal_newlines=True,
-            bufsize=1,
-            cwd=str(SCRIPT_DIR),
+            bufsize=0,
+            cwd=_SCRIPT_DIR,
             start_new_session=True,  # Create new process group
             env=env
         )
-        
-        # Stream output to log buffer
-        for line in iter(process.stdout.readline, ''):
-            if line:
-                log_buffer.append(line)
-                # Also write to file
-                with open(LOG_FILE, 'a') as f:
-                    f.write(line)
-        
+
+        # Stream output to log buffer and file. The pipe is read in 64 KiB
+        # non-blocking chunks - ceil(bytes/65536) syscalls per MB of output
+        # rather than one per line - and decoded once per completed batch.
+        # Each batch is persisted with a single os.write on the raw
+        # append-only fd; a per-line open/write/close costs three syscalls
+        # per line, which dominates CPU on chatty builds.
+        fd = process.stdout.fileno()
+        fcntl.fcntl(fd, fcntl.F_SETFL, fcntl.fcntl(fd, fcntl.F_GETFL) | os.O_NONBLOCK)
+
+        buf = []
+        pending = bytearray()  # trailing partial line between reads
+        last_flush = time.monotonic()
+        log_fd = _log_file_fd()
+
+        def flush_batch():
+            os.write(log_fd, ''.join(buf).encode('utf-8', 'replace'))
+            _log_publish(buf)
+            buf.clear()
+
+        eof = False
+        while not eof:
+            readable, _, _ = select.select([fd], [], [], LOG_BATCH_SECONDS)
+            if readable:
+                try:
+                    chunk = os.read(fd, 1 << 16)
+                except BlockingIOError:
+                    chunk = None
+                if chunk == b'':
+                    eof = True
+                elif chunk:
+                    pending += chunk
+                    nl = pending.rfind(b'\n')
+                    if nl >= 0:
+                        complete = pending[:nl + 1].decode('utf-8', 'replace')
+                        del pending[:nl + 1]
+                        buf.extend(complete.splitlines(keepends=True))
+            now = time.monotonic()
+            if buf and (len(buf) >= LOG_BATCH_LINES or now - last_flush >= LOG_BATCH_SECONDS):
+                flush_batch()
+                last_flush = now
+        if pending:
+            buf.append(pending.decode('utf-8', 'replace'))
+        if buf:
+            flush_batch()
+
         process.wait()
         
         # Don't add webapp status message - the build script already logs its own status
         # Exit codes: 0=success, 130=SIGINT, 143=SIGTERM, others=failure
             
     except Exception as e:
-        log_buffer.append(f"\n[{datetime.now().isoformat()}] Build error: {str(e)}\n")
+        _log_append(f"\n[{datetime.now().isoformat()}] Build error: {str(e)}\n")
 
 
 @app.route('/')
@@ -149,25 +481,78 @@ def index():
     return render_template('index.html')
 
 
-@app.route('/api/status')
-def api_status():
-    """Get current build status and database info"""
+# Serialized /api/status payload keyed on its stable content. The
+# timestamp only advances when build status or database info actually
+# changed; otherwise the previous bytes are returned verbatim, so the
+# payload-hash ETag in _json_bytes can match across polls and idle
+# dashboards get 304s instead of a fresh body every refresh cycle.
+_STATUS_CONTENT = {"key": None, "payload": b""}
+
+
+def _compute_status_payload():
+    """Serialize the /api/status payload, reusing unchanged content"""
     build_status = get_build_status()
-    db_info = get_db_info()
-    
+    db_info = dict(get_db_info())  # copy: don't grow the cached dict
+
     # Format sizes for display
     db_info['db_size_formatted'] = format_size(db_info['db_size'])
     db_info['tar_size_formatted'] = format_size(db_info['tar_size'])
-    
-    # Debug logging
-    print(f"[DEBUG] Build status: {build_status}")
-    print(f"[DEBUG] DB exists: {db_info['db_exists']}, Size: {db_info['db_size_formatted']}")
-    
-    return jsonify({
+
+    key = orjson.dumps({"build": build_status, "database": db_info})
+    if key == _STATUS_CONTENT["key"]:
+        return _STATUS_CONTENT["payload"]
+
+    payload = orjson.dumps({
         "build": build_status,
         "database": db_info,
         "timestamp": datetime.now().isoformat()
     })
+    _STATUS_CONTENT["key"] = key
+    _STATUS_CONTENT["payload"] = payload
+    return payload
+
+
+# Status refresher: one daemon thread derives the payload about once a
+# second and publishes frozen bytes; handlers return that object with a
+# memcpy no matter how many dashboard tabs poll. Goes back to sleep when
+# nobody has asked for ~30 s.
+_STATUS_REFRESH_INTERVAL = 1.0
+_STATUS_IDLE_TIMEOUT = 30.0
+_status_wanted = threading.Event()
+_status_payload = None
+_status_last_request = 0.0
+
+
+def _status_refresher():
+    global _status_payload
+    while True:
+        _status_wanted.wait()
+        try:
+            _status_payload = _compute_status_payload()
+        except Exception:
+            pass
+        if time.monotonic() - _status_last_request > _STATUS_IDLE_TIMEOUT:
+            _status_payload = None
+            _status_wanted.clear()
+            continue
+        time.sleep(_STATUS_REFRESH_INTERVAL)
+
+
+threading.Thread(target=_status_refresher, daemon=True).start()
+
+
+@app.route('/api/status')
+def api_status():
+    """Get current build status and database info"""
+    global _status_last_request
+    _status_last_request = time.monotonic()
+    _status_wanted.set()
+
+    payload = _status_payload
+    if payload is None:
+        # First hit after idle: compute inline rather than wait a cycle
+        payload = _compute_status_payload()
+    return _json_bytes(payload)
 
 
 @app.route('/api/logs')
@@ -176,22 +561,46 @@ def api_logs():
     lines = request.args.get('lines', 100, type=int)
     lines = min(lines, MAX_LOG_LINES)  # Cap at max buffer size
     
-    recent_logs = list(log_buffer)[-lines:] if log_buffer else []
-    
-    # Also try to read from log file if buffer is empty
-    if not recent_logs and LOG_FILE.exists():
+    # Snapshot the ring only when the publish sequence moved; idle polls
+    # reuse the previous copy
+    with _log_lock:
+        seq = _log_seq
+        if _LOG_SNAPSHOT["seq"] == seq and _LOG_SNAPSHOT["lines"] == lines:
+            recent_logs = _LOG_SNAPSHOT["val"]
+        else:
+            recent_logs = None
+
+    # ETag from the stable cache key instead of the payload bytes - the
+    # body embeds a timestamp, so a payload hash would change every poll
+    # and never 304. An empty ring means the logs come from the file
+    # tail, so the file size joins the key for that case.
+    etag = f"{seq:x}.{lines:x}"
+    if not len(log_buffer):
         try:
-            with open(LOG_FILE, 'r') as f:
-                all_lines = f.readlines()
-                recent_logs = all_lines[-lines:]
-        except Exception:
-            pass
-    
-    return jsonify({
+            etag += f".{os.stat(_LOG_FILE).st_size:x}"
+        except FileNotFoundError:
+            etag += ".0"
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers={'ETag': f'"{etag}"'})
+
+    if recent_logs is None:
+        recent_logs = log_buffer.tail(lines)
+        with _log_lock:
+            _LOG_SNAPSHOT["seq"] = seq
+            _LOG_SNAPSHOT["lines"] = lines
+            _LOG_SNAPSHOT["val"] = recent_logs
+
+    # Also try to read the tail of the log file if the buffer is empty
+    if not recent_logs:
+        recent_logs = _tail_log_file(lines)
+
+    resp = Response(orjson.dumps({
         "logs": recent_logs,
         "total_lines": len(log_buffer),
         "timestamp": datetime.now().isoformat()
-    })
+    }), mimetype='application/json')
+    resp.set_etag(etag)
+    return resp
 
 
 @app.route('/api/build', methods=['POST'])
@@ -200,18 +609,18 @@ def api_build():
     build_status = get_build_status()
     
     if build_status["status"] == "running":
-        return jsonify({
+        return _json({
             "success": False,
             "message": "A build is already running",
             "pid": build_status.get("pid")
-        }), 409
+        }, 409)
     
     if build_status["status"] == "stale_lock":
-        return jsonify({
+        return _json({
             "success": False,
             "message": "Stale lock file detected. Please clean it manually.",
             "pid": build_status.get("pid")
-        }), 409
+        }, 409)
     
     # Get parameters from request (defaults: target='nvd', custom_sigs=false)
     target = 'nvd'
@@ -224,20 +633,20 @@ def api_build():
     # Validate target
     valid_targets = ['nvd', 'quick', 'all', 'none']
     if target not in valid_targets:
-        return jsonify({
+        return _json({
             "success": False,
             "message": f"Invalid target '{target}'. Valid targets: {', '.join(valid_targets)}"
-        }), 400
+        }, 400)
     
-    # Clear old logs
-    if LOG_FILE.exists():
-        LOG_FILE.unlink()
+    # Clear old logs and drop the cached fd so the next write reopens
+    _log_file_reset()
     
     # Start build in background thread with parameters
     thread = threading.Thread(target=run_build_async, args=(target, custom_sigs), daemon=True)
     thread.start()
+    _invalidate_snapshot()
     
-    return jsonify({
+    return _json({
         "success": True,
         "message": f"Build started successfully (target: {target}, custom signatures: {custom_sigs})"
     })
@@ -249,74 +658,85 @@ def api_stop_build():
     build_status = get_build_status()
     
     if build_status["status"] != "running":
-        return jsonify({
+        return _json({
             "success": False,
             "message": "No build is currently running"
-        }), 409
+        }, 409)
     
     try:
         pid = build_status.get("pid")
         # Send SIGTERM to the entire process group to kill parent and all children
         try:
             os.killpg(os.getpgid(pid), 15)  # SIGTERM to process group
-            log_buffer.append(f"\n[{datetime.now().isoformat()}] Build stop requested (PID: {pid}, process group)\n")
+            _log_append(f"\n[{datetime.now().isoformat()}] Build stop requested (PID: {pid}, process group)\n")
         except ProcessLookupError:
             # Fallback to single process if process group doesn't exist
             os.kill(pid, 15)
-            log_buffer.append(f"\n[{datetime.now().isoformat()}] Build stop requested (PID: {pid})\n")
-        
-        return jsonify({
+            _log_append(f"\n[{datetime.now().isoformat()}] Build stop requested (PID: {pid})\n")
+
+        _invalidate_snapshot()
+        return _json({
             "success": True,
             "message": f"Stop signal sent to build process (PID: {pid})"
         })
     except ProcessLookupError:
-        return jsonify({
+        return _json({
             "success": False,
             "message": "Build process not found"
-        }), 404
+        }, 404)
     except Exception as e:
-        return jsonify({
+        return _json({
             "success": False,
             "message": f"Failed to stop build: {str(e)}"
-        }), 500
+        }, 500)
 
 
 @app.route('/api/download/db')
 def api_download_db():
     """Download the database file"""
-    db_tar = Path(OUTPUT_DIR) / "trivy.db.tar.gz"
-    
-    if not db_tar.exists():
-        return jsonify({
+    if not os.path.exists(_DB_TAR):
+        return _json({
             "success": False,
             "message": "Database file not found"
-        }), 404
+        }, 404)
     
-    return send_file(
-        db_tar,
-        as_attachment=True,
+    return _file_response(
+        _DB_TAR,
         download_name=f"trivy-db-{datetime.now().strftime('%Y%m%d')}.tar.gz",
         mimetype='application/gzip'
     )
 
 
+# Raw metadata.json bytes keyed on mtime - the file is small and only
+# changes when a build finishes, so repeated downloads are served from
+# memory without touching the disk.
+_META_BYTES_CACHE = {"mtime": None, "bytes": b""}
+
+
 @app.route('/api/download/metadata')
 def api_download_metadata():
     """Download the metadata file"""
-    metadata_file = Path(OUTPUT_DIR) / "metadata.json"
-    
-    if not metadata_file.exists():
-        return jsonify({
+    try:
+        st = os.stat(_METADATA_FILE)
+    except FileNotFoundError:
+        return _json({
             "success": False,
             "message": "Metadata file not found"
-        }), 404
-    
-    return send_file(
-        metadata_file,
-        as_attachment=True,
-        download_name=f"metadata-{datetime.now().strftime('%Y%m%d')}.json",
-        mimetype='application/json'
-    )
+        }, 404)
+
+    if st.st_mtime != _META_BYTES_CACHE["mtime"]:
+        with open(_METADATA_FILE, 'rb') as f:
+            _META_BYTES_CACHE["bytes"] = f.read()
+        _META_BYTES_CACHE["mtime"] = st.st_mtime
+
+    body = _META_BYTES_CACHE["bytes"]
+    resp = Response(body, mimetype='application/json', headers={
+        'Content-Disposition':
+            f'attachment; filename="metadata-{datetime.now().strftime("%Y%m%d")}.json"',
+        'Last-Modified': formatdate(st.st_mtime, usegmt=True),
+    })
+    resp.set_etag(hashlib.blake2b(body, digest_size=8).hexdigest())
+    return resp.make_conditional(request)
 
 
 @app.route('/api/clear-lock', methods=['POST'])
@@ -325,25 +745,26 @@ def api_clear_lock():
     build_status = get_build_status()
     
     if build_status["status"] == "running":
-        return jsonify({
+        return _json({
             "success": False,
             "message": "Cannot clear lock while build is running"
-        }), 409
+        }, 409)
     
     if LOCK_FILE.exists():
         try:
             LOCK_FILE.unlink()
-            return jsonify({
+            _invalidate_snapshot()
+            return _json({
                 "success": True,
                 "message": "Lock file cleared successfully"
             })
         except Exception as e:
-            return jsonify({
+            return _json({
                 "success": False,
                 "message": f"Failed to clear lock: {str(e)}"
-            }), 500
+            }, 500)
     
-    return jsonify({
+    return _json({
         "success": True,
         "message": "No lock file to clear"
     })
@@ -361,4 +782,7 @@ if __name__ == '__main__':
     print(f"Build script: {BUILD_SCRIPT}")
     print(f"Output directory: {OUTPUT_DIR}")
     
-    app.run(host='0.0.0.0', port=port, debug=debug)
+    # Dev-server fallback; run.sh starts gunicorn with threaded workers
+    # for production-ish use. threaded=True keeps status polls responsive
+    # while a download is streaming.
+    app.run(host='0.0.0.0', port=port, debug=debug, threaded=True)
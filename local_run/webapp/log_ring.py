@@ -0,0 +1,86 @@
+"""Fixed-capacity byte ring for the in-memory build log buffer."""
+
+import array
+import threading
+
+
+class LogRing:
+    """Fixed-capacity ring of the most recent log lines.
+
+    Lines live UTF-8 encoded in one preallocated bytearray with a circular
+    index of (start, length) pairs, instead of as up to max_lines separate
+    str objects. Appending is a memcpy into existing storage, so a chatty
+    build churns neither the allocator nor the GC.
+
+    Positions are tracked on a monotonic logical byte cursor; a line's
+    physical offset is its logical start modulo the capacity. Lines are
+    never split across the wrap point - the writer counts the skipped dead
+    zone as consumed bytes - so a stored line is intact exactly while its
+    logical start lies within the trailing capacity window, and eviction
+    only ever needs to compare the oldest line against that window.
+    """
+
+    def __init__(self, max_lines, capacity=1 << 20):
+        self._buf = bytearray(capacity)
+        self._cap = capacity
+        self._max = max_lines
+        self._starts = array.array('q', [0] * max_lines)  # logical offsets
+        self._lens = array.array('l', [0] * max_lines)
+        self._head = 0      # index slot of the oldest line
+        self._count = 0
+        self._logical = 0   # monotonic write cursor, never wraps
+        self._lock = threading.Lock()
+
+    def extend(self, lines):
+        """Append a batch of text lines as one locked operation"""
+        with self._lock:
+            for line in lines:
+                self._append(line.encode('utf-8', 'replace'))
+
+    def _append(self, data):
+        length = len(data)
+        if length > self._cap:
+            data = data[-self._cap:]
+            length = self._cap
+        pos = self._logical % self._cap
+        if pos + length > self._cap:
+            # Skip the dead zone at the end of the buffer; counting it as
+            # consumed keeps the logical-to-physical mapping consistent and
+            # lets the window check below retire anything stored there.
+            self._logical += self._cap - pos
+            pos = 0
+        start = self._logical
+        end = start + length
+        # Drop the oldest line while the index is full or its storage has
+        # fallen out of the live window [end - cap, end)
+        while self._count and (self._count == self._max
+                               or self._starts[self._head] < end - self._cap):
+            self._head = (self._head + 1) % self._max
+            self._count -= 1
+        self._buf[pos:pos + length] = data
+        slot = (self._head + self._count) % self._max
+        self._starts[slot] = start
+        self._lens[slot] = length
+        self._count += 1
+        self._logical = end
+
+    def tail(self, n):
+        """Decode and return the last n lines as a list of str"""
+        with self._lock:
+            take = min(n, self._count)
+            first = self._head + self._count - take
+            out = []
+            for i in range(take):
+                slot = (first + i) % self._max
+                pos = self._starts[slot] % self._cap
+                out.append(self._buf[pos:pos + self._lens[slot]].decode('utf-8', 'replace'))
+            return out
+
+    def clear(self):
+        with self._lock:
+            self._head = 0
+            self._count = 0
+            self._logical = 0
+
+    def __len__(self):
+        return self._count
@@ -6,4 +6,16 @@ export PATH="$HOME/go/bin:$PATH"
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" >/dev/null 2>&1 && pwd)"
 cd "$SCRIPT_DIR" || exit 1
 . ./venv/bin/activate
+
+PORT="${PORT:-5000}"
+
+# Prefer gunicorn with threaded workers so large /api/download/db
+# transfers don't serialize against /api/status polls. Single worker
+# process on purpose: the in-memory log buffer lives in the process and
+# forked workers would each hold a divergent copy.
+if command -v gunicorn >/dev/null 2>&1; then
+    exec gunicorn -w 1 -k gthread --threads 8 -b "0.0.0.0:${PORT}" app:app
+fi
+
+# Fallback: Werkzeug dev server
 python app.py
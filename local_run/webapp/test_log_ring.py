@@ -0,0 +1,79 @@
+"""Tests for the LogRing byte ring backing the in-memory log buffer."""
+
+import random
+import unittest
+from collections import deque
+
+from log_ring import LogRing
+
+
+class LogRingTest(unittest.TestCase):
+    def test_append_and_tail(self):
+        ring = LogRing(5, capacity=4096)
+        ring.extend([f"line {i}\n" for i in range(3)])
+        self.assertEqual(len(ring), 3)
+        self.assertEqual(ring.tail(10), ["line 0\n", "line 1\n", "line 2\n"])
+        self.assertEqual(ring.tail(2), ["line 1\n", "line 2\n"])
+
+    def test_max_lines_eviction(self):
+        ring = LogRing(5, capacity=4096)
+        ring.extend([f"line {i}\n" for i in range(9)])
+        self.assertEqual(len(ring), 5)
+        self.assertEqual(ring.tail(10), [f"line {i}\n" for i in range(4, 9)])
+
+    def test_clear(self):
+        ring = LogRing(5, capacity=4096)
+        ring.extend(["a\n", "b\n"])
+        ring.clear()
+        self.assertEqual(len(ring), 0)
+        self.assertEqual(ring.tail(5), [])
+        ring.extend(["c\n"])
+        self.assertEqual(ring.tail(5), ["c\n"])
+
+    def test_oversized_line_keeps_tail_bytes(self):
+        ring = LogRing(10, capacity=64)
+        ring.extend(["x" * 200 + "\n"])
+        self.assertEqual(len(ring), 1)
+        self.assertEqual(ring.tail(1), ["x" * 63 + "\n"])
+
+    def test_wrap_with_variable_length_lines_matches_deque(self):
+        # Regression test: lines long enough that the byte ring wraps
+        # before the line cap evicts used to leave stale index entries
+        # pointing into overwritten storage after the wrap, so tail()
+        # returned garbled and duplicated lines. Compare every snapshot
+        # against a deque reference - the ring may hold fewer lines than
+        # the deque (byte capacity evicts earlier), but what it holds must
+        # be an exact suffix.
+        rng = random.Random(42)
+        max_lines = 50
+        ring = LogRing(max_lines, capacity=4096)
+        ref = deque(maxlen=max_lines)
+        for i in range(2000):
+            line = f"{i:06d}:" + "x" * rng.randint(100, 600) + "\n"
+            ring.extend([line])
+            ref.append(line)
+            if i % 50 == 0:
+                tail = ring.tail(max_lines)
+                self.assertEqual(tail, list(ref)[-len(tail):])
+        tail = ring.tail(max_lines)
+        self.assertGreater(len(tail), 0)
+        self.assertEqual(tail, list(ref)[-len(tail):])
+
+    def test_wrap_in_batches_matches_deque(self):
+        rng = random.Random(7)
+        max_lines = 200
+        ring = LogRing(max_lines, capacity=1 << 14)
+        ref = deque(maxlen=max_lines)
+        for _ in range(300):
+            batch = [
+                "y" * rng.randint(1, 400) + "\n"
+                for _ in range(rng.randint(1, 20))
+            ]
+            ring.extend(batch)
+            ref.extend(batch)
+            tail = ring.tail(max_lines)
+            self.assertEqual(tail, list(ref)[-len(tail):])
+
+
+if __name__ == '__main__':
+    unittest.main()